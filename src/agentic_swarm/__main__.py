@@ -4,6 +4,7 @@ from __future__ import annotations
 import argparse
 import asyncio
 import logging
+from collections.abc import Callable
 from typing import Any
 
 from .cli import UserAgent
@@ -14,6 +15,16 @@ from .swarm import Swarm
 from .workers import CoderAgent, PlannerAgent, ReviewerAgent
 
 
+def _loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Use uvloop's event loop when the optional ``fast`` extra is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    factory: Callable[[], asyncio.AbstractEventLoop] = uvloop.new_event_loop
+    return factory
+
+
 def _setup_logging(level: str) -> None:
     logging.basicConfig(
         level=getattr(logging, level.upper(), logging.INFO),
@@ -24,7 +35,9 @@ def _setup_logging(level: str) -> None:
 async def _async_main(args: argparse.Namespace) -> int:
     _setup_logging(args.log_level)
 
-    config: dict[str, Any] = load_config(args.config) if args.config else {}
+    config: dict[str, Any] = (
+        await asyncio.to_thread(load_config, args.config) if args.config else {}
+    )
     logging.getLogger("agentic_swarm").info("loaded config keys: %s", list(config.keys()))
 
     bus = MessageBus()
@@ -62,7 +75,8 @@ def main(argv: list[str] | None = None) -> int:
     args = parser.parse_args(argv)
 
     try:
-        return asyncio.run(_async_main(args))
+        with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+            return runner.run(_async_main(args))
     except KeyboardInterrupt:
         return 130
 
@@ -1,11 +1,19 @@
 """Base Agent class - all swarm agents inherit from this."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections.abc import Iterable
 from typing import Any
 
-from .communication import Message, MessageBus, create_message
+from .communication import (
+    InboxClosedError,
+    Message,
+    MessageBus,
+    MsgType,
+    create_message,
+    release_message,
+)
 
 
 class MessageHandlingError(Exception):
@@ -27,53 +35,87 @@ class Agent:
         self.capabilities = set(capabilities or [])
         self.bus = bus
         self.inbox = bus.register_agent(name)
+        # Shared with the bus so sends can skip its routing and resolve the inbox directly.
+        self._bus_queues = bus._queues
         self.logger = logging.getLogger(f"agentic_swarm.agent.{name}")
         self._running = False
 
+    @property
+    def logger(self) -> logging.Logger:
+        return self._logger
+
+    @logger.setter
+    def logger(self, logger: logging.Logger) -> None:
+        # Hot paths check the cached flag instead of calling into logging per message.
+        self._logger = logger
+        self._info = logger.isEnabledFor(logging.INFO)
+
     async def run(self) -> None:
         """Main agent loop. Processes inbound messages until shutdown."""
         self._running = True
         self.logger.info("agent started")
+        # Bound once: the loop body runs for every message.
+        inbox_get = self.inbox.get
+        drain = self._drain_nowait
+        handle = self.handle_message
         while self._running:
-            message = await self.inbox.get()
-            if message.type == "shutdown":
+            try:
+                first = await inbox_get()
+            except InboxClosedError:
                 self.logger.info("shutdown received")
-                self._running = False
                 break
-            try:
-                await self.handle_message(message)
-            except MessageHandlingError:
-                self.logger.exception("error handling message: %s", message)
-            except (KeyError, ValueError, TypeError, AttributeError) as exc:
-                self.logger.exception(
-                    "unexpected %s handling message: %s", type(exc).__name__, message
-                )
+            # Wake once, then handle everything that is already queued before yielding.
+            for message in drain([first]):
+                try:
+                    await handle(message)
+                except MessageHandlingError:
+                    self.logger.exception("error handling message: %s", message)
+                except (KeyError, ValueError, TypeError, AttributeError) as exc:
+                    self.logger.exception(
+                        "unexpected %s handling message: %s", type(exc).__name__, message
+                    )
+                release_message(message)
+        self._running = False
         self.logger.info("agent stopped")
 
+    def _drain_nowait(self, batch: list[Message]) -> list[Message]:
+        """Append every message already waiting in the inbox to ``batch``."""
+        get_nowait = self.inbox.get_nowait
+        while True:
+            try:
+                batch.append(get_nowait())
+            except asyncio.QueueEmpty:
+                return batch
+
     async def handle_message(self, message: Message) -> None:
-        """Handle a single message. Override in subclasses."""
-        self.logger.info("message received: %s", message.type)
+        """Handle a single message. Override in subclasses; the default ignores it.
+
+        The message is recycled once this returns, so do not store it; keep its payload
+        or copy the fields you need.
+        """
+
+    def send_sync(
+        self, recipient: str, message_type: MsgType | str, payload: Any | None = None
+    ) -> None:
+        """Send a direct message without awaiting; inboxes are unbounded, so it never blocks."""
+        queue = self._bus_queues.get(recipient)
+        if queue is None:
+            self.logger.warning("recipient not found: %s", recipient)
+            return
+        queue.put_nowait(create_message(self.name, recipient, message_type, payload))
 
-    async def send(self, recipient: str, message_type: str, payload: Any | None = None) -> None:
+    async def send(
+        self, recipient: str, message_type: MsgType | str, payload: Any | None = None
+    ) -> None:
         """Send a direct message to another agent."""
-        message = create_message(
-            sender=self.name,
-            recipient=recipient,
-            message_type=message_type,
-            payload=payload,
-        )
-        await self.bus.send(message)
-
-    async def broadcast(self, message_type: str, payload: Any | None = None) -> None:
+        self.send_sync(recipient, message_type, payload)
+
+    async def broadcast(self, message_type: MsgType | str, payload: Any | None = None) -> None:
         """Broadcast a message to all agents."""
-        message = create_message(
-            sender=self.name,
-            recipient=None,
-            message_type=message_type,
-            payload=payload,
-        )
-        await self.bus.send(message)
+        message = create_message(self.name, None, message_type, payload)
+        for queue in self._bus_queues.values():
+            queue.put_nowait(message)
 
     async def request_shutdown(self) -> None:
         """Request a swarm-wide shutdown."""
-        await self.broadcast("shutdown")
+        self.bus.shutdown()
@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
-from typing import Any
+import sys
+import threading
 
 from .agent import Agent
-from .communication import Message, MessageBus
+from .communication import Message, MessageBus, MsgType
 
 BANNER = """\
 ==================================================
@@ -18,6 +20,9 @@ BANNER = """\
 
 PROMPT = "\nswarm> "
 
+# Lines the stdin reader may buffer ahead of the REPL, e.g. when input is piped in.
+LINE_BUFFER = 64
+
 
 class UserAgent(Agent):
     """Agent that bridges the human user and the swarm via an interactive REPL."""
@@ -26,6 +31,15 @@ class UserAgent(Agent):
         super().__init__(name=name, role="user", bus=bus)
         self.logger = logging.getLogger("agentic_swarm.user")
         self._output_lines: list[str] = []
+        # Filled by one long-lived stdin reader thread; None marks end of input.
+        # The queue itself is unbounded because the loop side must never block or
+        # fail a put_nowait; the reader takes a slot per line instead, and the REPL
+        # hands it back once it has read that line.
+        self._lines: asyncio.Queue[str | None] = asyncio.Queue()
+        self._line_slots = threading.BoundedSemaphore(LINE_BUFFER)
+        self._reader: threading.Thread | None = None
+        # Resolved by handle_message when the final user_output of a request arrives.
+        self._final: asyncio.Future[None] | None = None
 
     async def run(self) -> None:
         """Interactive REPL: read user input, send to controller, print results."""
@@ -33,84 +47,123 @@ class UserAgent(Agent):
         self.logger.info("user agent started")
         print(BANNER)
 
-        loop = asyncio.get_running_loop()
-
-        while self._running:
-            try:
-                line = await loop.run_in_executor(None, self._read_input)
-            except (EOFError, KeyboardInterrupt):
-                break
-
-            if line is None:
-                break
+        self._start_reader()
+        listener = asyncio.create_task(self._listen())
 
-            stripped = line.strip()
-            if not stripped:
-                continue
-
-            if stripped.lower() in ("quit", "exit"):
-                print("Shutting down swarm...")
-                await self.request_shutdown()
-                break
-
-            if stripped.lower() == "status":
-                print("  Swarm is running. Agents are listening.")
-                continue
+        try:
+            while self._running:
+                print(PROMPT, end="", flush=True)
+                line = await self._lines.get()
+                if line is None:
+                    break
+                self._line_slots.release()
 
-            await self.send("controller", "user_request", stripped)
-            print("  -> Request sent to swarm.\n")
+                stripped = line.strip()
+                if not stripped:
+                    continue
 
-            await self._wait_for_results(timeout=30.0)
+                if stripped.lower() in ("quit", "exit"):
+                    print("Shutting down swarm...")
+                    await self.request_shutdown()
+                    break
 
+                if stripped.lower() == "status":
+                    print("  Swarm is running. Agents are listening.")
+                    continue
+
+                self._expect_final()
+                self.send_sync("controller", MsgType.USER_REQUEST, stripped)
+                print("  -> Request sent to swarm.\n")
+
+                await self._wait_for_results(timeout=30.0)
+        finally:
+            # Also on cancellation (a failing sibling agent, Ctrl-C): never leave
+            # the listener consuming the inbox after run() is gone.
+            listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await listener
+            self._discard_markers()
         self.logger.info("user agent stopped")
 
-    def _read_input(self) -> str | None:
-        """Blocking stdin read, called via run_in_executor."""
+    async def _listen(self) -> None:
+        """Consume the inbox in the background, printing output as it arrives."""
+        try:
+            await super().run()
+        finally:
+            # The bus shut down (or the REPL ended): release anything still waiting.
+            self._running = False
+            self._lines.put_nowait(None)
+            if self._final is not None and not self._final.done():
+                self._final.set_result(None)
+
+    def _start_reader(self) -> None:
+        """Start the stdin reader thread unless one is still running.
+
+        The reader clears ``_reader`` before it exits, so a later ``run()`` starts a
+        fresh one instead of waiting on a thread that has already hit EOF.
+        """
+        if self._reader is not None:
+            return
+        self._reader = threading.Thread(
+            target=self._reader_loop,
+            args=(asyncio.get_running_loop(),),
+            name=f"{self.name}-stdin",
+            daemon=True,
+        )
+        self._reader.start()
+
+    def _reader_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Blocking stdin reads, handed to the event loop line by line."""
+        slots = self._line_slots
         try:
-            return input(PROMPT)
-        except (EOFError, KeyboardInterrupt):
-            return None
-
-    async def _drain_inbox(self) -> list[dict[str, Any]]:
-        """Pull all available user_output messages from inbox without blocking."""
-        messages: list[dict[str, Any]] = []
-        while True:
-            try:
-                msg: Message = self.inbox.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-            if msg.type == "shutdown":
-                self._running = False
-                break
-            if msg.type == "user_output" and isinstance(msg.payload, dict):
-                messages.append(msg.payload)
-        return messages
+            for line in sys.stdin:
+                slots.acquire()
+                loop.call_soon_threadsafe(self._lines.put_nowait, line)
+        except (OSError, ValueError):
+            pass  # stdin closed or detached: treat it like EOF
+        except RuntimeError:
+            self._reader = None
+            return  # the event loop is already closed
+        self._reader = None
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(self._lines.put_nowait, None)
+
+    def _discard_markers(self) -> None:
+        """Drop end-of-input markers left in ``_lines`` so a later ``run()`` ignores them.
+
+        Unread input lines are kept, in order.
+        """
+        lines = self._lines
+        kept = []
+        while not lines.empty():
+            line = lines.get_nowait()
+            if line is not None:
+                kept.append(line)
+        for line in kept:
+            lines.put_nowait(line)
+
+    def _expect_final(self) -> asyncio.Future[None]:
+        """Create the future for the next final result; call before sending the request."""
+        self._final = asyncio.get_running_loop().create_future()
+        return self._final
 
     async def _wait_for_results(self, timeout: float = 30.0) -> None:
         """Block until a final=True message arrives or timeout elapses."""
-        deadline = asyncio.get_running_loop().time() + timeout
-        while self._running:
-            remaining = deadline - asyncio.get_running_loop().time()
-            if remaining <= 0:
-                print("  (timed out waiting for response)")
-                break
-            try:
-                msg: Message = await asyncio.wait_for(
-                    self.inbox.get(), timeout=min(remaining, 1.0)
-                )
-            except TimeoutError:
-                continue
-
-            if msg.type == "shutdown":
-                self._running = False
-                break
-
-            if msg.type == "user_output" and isinstance(msg.payload, dict):
-                text = msg.payload.get("text", "")
-                print(f"  {text}")
-                if msg.payload.get("final", False):
-                    break
+        final = self._final if self._final is not None else self._expect_final()
+        try:
+            await asyncio.wait_for(final, timeout)
+        except TimeoutError:
+            print("  (timed out waiting for response)")
+        finally:
+            self._final = None
 
     async def handle_message(self, message: Message) -> None:
-        """Not used in REPL mode — messages are consumed by _wait_for_results."""
-        self.logger.debug("handle_message called: %s", message.type)
+        """Print user_output messages and resolve the pending final result."""
+        if message.type is not MsgType.USER_OUTPUT or not isinstance(message.payload, dict):
+            self.logger.debug("ignoring message: %s", message.type)
+            return
+        text: str = message.payload.get("text", "")
+        print("  " + text.replace("\n", "\n  "))
+        final = self._final
+        if message.payload.get("final", False) and final is not None and not final.done():
+            final.set_result(None)
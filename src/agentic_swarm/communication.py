@@ -2,95 +2,266 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
-import time
-import uuid
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
 from typing import Any
 
+# Inboxes are slotted and many, so they share the bus logger rather than holding one.
+_logger = logging.getLogger("agentic_swarm.bus")
 
-@dataclass(frozen=True)
+
+class MsgType(IntEnum):
+    """Built-in message types. Compare with ``is``; members are singletons."""
+
+    USER_REQUEST = 1
+    TASK_ASSIGN = 2
+    TASK_RESULT = 3
+    TASK_REQUEST = 4
+    USER_OUTPUT = 5
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+class ResultType(IntEnum):
+    """Kind of work carried by a ``task_result`` payload."""
+
+    PLAN = 0
+    CODE = 1
+    REVIEW = 2
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+@dataclass(slots=True)
 class Message:
-    """Immutable message payload passed between agents."""
+    """Message passed between agents.
+
+    Messages are pooled: once the receiving agent has handled a direct message it is
+    handed back to ``release_message`` and its fields are reused by a later
+    ``create_message`` call. Handlers must not keep a reference to the message itself
+    beyond ``handle_message``; copy out the fields (or the payload) they need instead.
+    """
 
-    id: str
+    id: int
     sender: str
     recipient: str | None
-    type: str
+    type: MsgType | str
     payload: Any
     timestamp: float
+    # Set while the message sits in the pool, so releasing it twice is a no-op.
+    _pooled: bool = field(default=False, repr=False, compare=False)
+
+
+@dataclass(slots=True)
+class TaskResult:
+    """Payload of a ``task_result`` message; unused fields keep their defaults."""
+
+    task_id: int | None
+    request_id: int | None
+    result_type: ResultType
+    description: str = ""
+    subtasks: tuple[str, ...] = ()
+    code: str = ""
+    verdict: str = ""
+
+
+# Message ids only need to be unique within this process, so a counter is enough.
+_next_id = itertools.count(1).__next__
+
+# Free list of handled messages; the swarm runs on one event loop, so no lock is needed.
+_MESSAGE_POOL: list[Message] = []
+_MESSAGE_POOL_LIMIT = 1024
 
 
 def create_message(
     sender: str,
     recipient: str | None,
-    message_type: str,
+    message_type: MsgType | str,
     payload: Any | None = None,
+    timestamp: float = 0.0,
 ) -> Message:
-    """Create a new message with a unique id and timestamp."""
-    return Message(
-        id=str(uuid.uuid4()),
-        sender=sender,
-        recipient=recipient,
-        type=message_type,
-        payload=payload,
-        timestamp=time.time(),
+    """Create a new message with a process-unique id.
+
+    Nothing on the routing path reads the timestamp, so it defaults to 0.0; use
+    ``create_message_ts`` when a consumer needs one.
+    """
+    if not _MESSAGE_POOL:
+        return Message(_next_id(), sender, recipient, message_type, payload, timestamp)
+    message = _MESSAGE_POOL.pop()
+    message._pooled = False
+    message.id = _next_id()
+    message.sender = sender
+    message.recipient = recipient
+    message.type = message_type
+    message.payload = payload
+    message.timestamp = timestamp
+    return message
+
+
+def create_message_ts(
+    sender: str,
+    recipient: str | None,
+    message_type: MsgType | str,
+    payload: Any | None = None,
+) -> Message:
+    """Create a message stamped with the running event loop's clock."""
+    return create_message(
+        sender, recipient, message_type, payload, asyncio.get_running_loop().time()
     )
 
 
+def release_message(message: Message) -> None:
+    """Return a handled message to the pool. The caller must drop its reference.
+
+    Releasing a message that is already pooled (e.g. one object sent twice) is a no-op.
+    """
+    if message.recipient is None or message._pooled:
+        # Broadcasts sit in every inbox at once, so no single receiver owns them;
+        # a pooled message is already free.
+        return
+    if len(_MESSAGE_POOL) < _MESSAGE_POOL_LIMIT:
+        message.payload = None
+        message._pooled = True
+        _MESSAGE_POOL.append(message)
+
+
+class InboxClosedError(Exception):
+    """Raised by ``Inbox.get`` once the inbox is closed and fully drained."""
+
+
+class Inbox:
+    """Unbounded per-agent inbox: a deque plus a single wakeup event.
+
+    Implements the subset of the ``asyncio.Queue`` API the swarm uses, without the
+    getter/putter bookkeeping a general multi-consumer queue needs.
+    """
+
+    __slots__ = ("_items", "_ready", "_closed")
+
+    def __init__(self) -> None:
+        self._items: deque[Message] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def put_nowait(self, message: Message) -> None:
+        if self._closed:
+            # Only the backlog at close time is drained; anything later would keep a
+            # self-sending agent alive forever.
+            _logger.debug("inbox closed, dropping message: %s", message)
+            return
+        self._items.append(message)
+        self._ready.set()
+
+    async def put(self, message: Message) -> None:
+        self.put_nowait(message)
+
+    def get_nowait(self) -> Message:
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise asyncio.QueueEmpty from None
+
+    async def get(self) -> Message:
+        items = self._items
+        while not items:
+            if self._closed:
+                raise InboxClosedError
+            self._ready.clear()
+            await self._ready.wait()
+        return items.popleft()
+
+    def close(self) -> None:
+        """Stop accepting messages and wake the consumer.
+
+        ``get`` keeps returning what was already queued, then raises ``InboxClosedError``.
+        """
+        self._closed = True
+        self._ready.set()
+
+
 class MessageBus:
     """Simple in-memory message bus for agent communication."""
 
     def __init__(self) -> None:
-        self._queues: dict[str, asyncio.Queue[Message]] = {}
+        self._queues: dict[str, Inbox] = {}
+        self.shutdown_event = asyncio.Event()
         self.logger = logging.getLogger("agentic_swarm.bus")
 
-    def register_agent(self, name: str) -> asyncio.Queue[Message]:
-        """Register an agent and return its inbox queue."""
+    def register_agent(self, name: str) -> Inbox:
+        """Register an agent and return its inbox."""
         if name in self._queues:
             raise ValueError(f"agent already registered: {name}")
-        queue: asyncio.Queue[Message] = asyncio.Queue()
+        queue = Inbox()
+        if self.shutdown_event.is_set():
+            queue.close()
         self._queues[name] = queue
         self.logger.info("agent registered: %s", name)
         return queue
 
+    def shutdown(self) -> None:
+        """Signal swarm-wide shutdown by closing every inbox; idempotent."""
+        if self.shutdown_event.is_set():
+            return
+        self.shutdown_event.set()
+        for queue in self._queues.values():
+            queue.close()
+        self.logger.info("shutdown signalled")
+
     async def send(self, message: Message) -> None:
         """Send a message to a recipient or broadcast if recipient is None."""
         if message.recipient is None:
-            await self._broadcast(message)
+            self._broadcast(message)
             return
         queue = self._queues.get(message.recipient)
         if queue is None:
             self.logger.warning("recipient not found: %s", message.recipient)
             return
-        await queue.put(message)
+        queue.put_nowait(message)
 
-    async def _broadcast(self, message: Message) -> None:
-        if not self._queues:
-            return
+    def _broadcast(self, message: Message) -> None:
         for queue in self._queues.values():
-            await queue.put(message)
+            queue.put_nowait(message)
 
 
 class SharedState:
-    """Async-safe shared state for agents."""
+    """Async-safe shared state for agents.
+
+    Writers serialise on the lock and publish a fresh dict; readers never lock and
+    always see a complete snapshot, since rebinding ``_data`` is atomic.
+    """
 
     def __init__(self) -> None:
         self._data: dict[str, Any] = {}
         self._lock = asyncio.Lock()
 
     async def get(self, key: str, default: Any | None = None) -> Any:
-        async with self._lock:
-            return self._data.get(key, default)
+        return self._data.get(key, default)
 
     async def set(self, key: str, value: Any) -> None:
         async with self._lock:
-            self._data[key] = value
+            data = dict(self._data)
+            data[key] = value
+            self._data = data
 
     async def update(self, values: dict[str, Any]) -> None:
         async with self._lock:
-            self._data.update(values)
+            self._data = {**self._data, **values}
 
     async def snapshot(self) -> dict[str, Any]:
-        async with self._lock:
-            return dict(self._data)
+        """Return the current state; later writes do not change it.
+
+        Writers publish a new dict instead of mutating this one, so it is returned
+        without copying. Treat it as read-only.
+        """
+        return self._data
@@ -1,6 +1,7 @@
 """Configuration management - loads YAML and environment overrides."""
 from __future__ import annotations
 
+import functools
 import os
 from pathlib import Path
 from typing import Any
@@ -12,6 +13,22 @@ except ImportError as exc:
         "pyyaml is required: pip install pyyaml"
     ) from exc
 
+# libyaml's C loader when PyYAML was built with it; the pure-Python loader otherwise.
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Scalars YAML would turn into bools/None; anything else that is not a number stays a str.
+_LITERALS: dict[str, Any] = {
+    "true": True,
+    "false": False,
+    "yes": True,
+    "no": False,
+    "on": True,
+    "off": False,
+    "null": None,
+    "~": None,
+    "": None,
+}
+
 
 def load_config(path: str | Path | None, env_prefix: str = "AGENTIC_SWARM_") -> dict[str, Any]:
     """Load configuration from YAML and merge environment overrides."""
@@ -21,7 +38,7 @@ def load_config(path: str | Path | None, env_prefix: str = "AGENTIC_SWARM_") ->
         path_obj = Path(path)
         if not path_obj.exists():
             raise FileNotFoundError(f"config file not found: {path_obj}")
-        data = yaml.safe_load(path_obj.read_text(encoding="utf-8"))
+        data = yaml.load(path_obj.read_text(encoding="utf-8"), Loader=_Loader)
         if isinstance(data, dict):
             config.update(data)
 
@@ -41,24 +58,47 @@ def _load_env_overrides(prefix: str) -> dict[str, Any]:
 
 
 def _parse_value(value: str) -> Any:
+    if value[:1] in ("[", "{", '"', "'"):
+        # Only flow collections and quoted strings need the full YAML parser.
+        try:
+            return yaml.load(value, Loader=_Loader)
+        except yaml.YAMLError:
+            return value
+    return _parse_scalar(value)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_scalar(value: str) -> Any:
+    """Parse a plain env value as int, float, bool or None; otherwise keep the string."""
     try:
-        return yaml.safe_load(value)
-    except yaml.YAMLError:
-        return value
+        return int(value)
+    except ValueError:
+        pass
+    if value.lstrip("+-.")[:1].isdigit():
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return _LITERALS.get(value.lower(), value)
 
 
 def _set_nested(target: dict[str, Any], path: list[str], value: Any) -> None:
     current = target
     for segment in path[:-1]:
-        if segment not in current or not isinstance(current[segment], dict):
-            current[segment] = {}
-        current = current[segment]
+        child = current.get(segment)
+        if not isinstance(child, dict):
+            child = current[segment] = {}
+        current = child
     current[path[-1]] = value
 
 
 def _deep_update(target: dict[str, Any], updates: dict[str, Any]) -> None:
-    for key, value in updates.items():
-        if isinstance(value, dict) and isinstance(target.get(key), dict):
-            _deep_update(target[key], value)
-        else:
-            target[key] = value
+    stack = [(target, updates)]
+    while stack:
+        dest, source = stack.pop()
+        for key, value in source.items():
+            current = dest.get(key)
+            if isinstance(value, dict) and isinstance(current, dict):
+                stack.append((current, value))
+            else:
+                dest[key] = value
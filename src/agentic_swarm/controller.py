@@ -1,38 +1,44 @@
 """Controller agent - routes tasks and orchestrates the swarm."""
 from __future__ import annotations
 
+import asyncio
+import itertools
 import logging
-import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from typing import Any
 
 from .agent import Agent
-from .communication import Message, MessageBus
+from .communication import Message, MessageBus, MsgType, ResultType, TaskResult
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Unit of work tracked by the controller."""
 
-    id: str
+    id: int
     description: str
     payload: Any | None = None
     status: str = "pending"
     assignee: str | None = None
     task_type: str = "generic"
-    request_id: str | None = None
+    request_id: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestState:
     """Tracks the lifecycle of a single user request through the pipeline."""
 
-    request_id: str
+    request_id: int
     user_agent: str
     description: str
     pending_subtasks: int = 0
-    coded_items: list[dict[str, Any]] = field(default_factory=list)
+    coded_items: list[TaskResult] = field(default_factory=list)
     phase: str = "planning"
+    # Progress lines waiting to go out to the user as one user_output message.
+    pending_output: list[str] = field(default_factory=list)
+    flush_scheduled: bool = False
 
 
 class Controller(Agent):
@@ -46,58 +52,88 @@ class Controller(Agent):
         capabilities: list[str] | None = None,
     ) -> None:
         super().__init__(name=name, role=role, bus=bus, capabilities=capabilities)
-        self._tasks: dict[str, Task] = {}
-        self._requests: dict[str, RequestState] = {}
+        # Only live tasks are kept; finished ones are dropped when their result arrives.
+        self._tasks: dict[int, Task] = {}
+        # Ids of tasks that may still be pending, oldest first; stale ids are skipped lazily.
+        self._pending_tasks: deque[int] = deque()
+        self._requests: dict[int, RequestState] = {}
+        self._next_task_id = itertools.count(1).__next__
+        self._next_request_id = itertools.count(1).__next__
         self.logger = logging.getLogger("agentic_swarm.controller")
+        self._handlers: dict[MsgType | str, Callable[[Message], Awaitable[None]]] = {
+            MsgType.USER_REQUEST: self._handle_user_request,
+            MsgType.TASK_RESULT: self._handle_task_result,
+            MsgType.TASK_REQUEST: self._handle_task_request,
+        }
+        self._handler_for = self._handlers.get
+        self._result_handlers: dict[
+            ResultType, Callable[[RequestState, TaskResult], Awaitable[None]]
+        ] = {
+            ResultType.PLAN: self._on_plan_complete,
+            ResultType.CODE: self._on_code_complete,
+            ResultType.REVIEW: self._on_review_complete,
+        }
 
     def create_task(
         self,
         description: str,
         payload: Any | None = None,
         task_type: str = "generic",
-        request_id: str | None = None,
+        request_id: int | None = None,
     ) -> Task:
         task = Task(
-            id=str(uuid.uuid4()),
+            id=self._next_task_id(),
             description=description,
             payload=payload,
             task_type=task_type,
             request_id=request_id,
         )
         self._tasks[task.id] = task
-        self.logger.info("task created: %s (%s)", task.id, task_type)
+        self._pending_tasks.append(task.id)
+        if self._info:
+            self.logger.info("task created: %s (%s)", task.id, task_type)
         return task
 
-    async def assign_task(self, task_id: str, agent_name: str) -> None:
+    async def assign_task(self, task_id: int, agent_name: str) -> None:
+        self._assign(task_id, agent_name)
+
+    def _assign(self, task_id: int, agent_name: str) -> None:
         task = self._tasks.get(task_id)
         if task is None:
             self.logger.warning("task not found: %s", task_id)
             return
         task.status = "assigned"
         task.assignee = agent_name
-        await self.send(agent_name, "task_assign", task)
-        self.logger.info("task assigned: %s -> %s", task_id, agent_name)
+        pending = self._pending_tasks
+        if pending and pending[-1] == task_id:
+            # The usual create-then-assign case: drop it now rather than leaving a stale id.
+            pending.pop()
+        self.send_sync(agent_name, MsgType.TASK_ASSIGN, task)
+        if self._info:
+            self.logger.info("task assigned: %s -> %s", task_id, agent_name)
 
     async def handle_message(self, message: Message) -> None:
-        if message.type == "user_request":
-            await self._handle_user_request(message)
-            return
-        if message.type == "task_result" and isinstance(message.payload, dict):
-            await self._handle_task_result(message)
+        handler = self._handler_for(message.type)
+        if handler is None:
+            await super().handle_message(message)
             return
-        if message.type == "task_request":
-            for task in self._tasks.values():
-                if task.status == "pending":
-                    await self.assign_task(task.id, message.sender)
-                    return
+        await handler(message)
+
+    async def _handle_task_request(self, message: Message) -> None:
+        """Hand the first pending task to the worker that asked for one."""
+        pending = self._pending_tasks
+        while pending:
+            task = self._tasks.get(pending.popleft())
+            if task is not None and task.status == "pending":
+                self._assign(task.id, message.sender)
+                return
+        if self._info:
             self.logger.info("no pending tasks for %s", message.sender)
-            return
-        await super().handle_message(message)
 
     async def _handle_user_request(self, message: Message) -> None:
         """Start the pipeline: create a planning task and assign to planner."""
         description = message.payload if isinstance(message.payload, str) else str(message.payload)
-        request_id = str(uuid.uuid4())
+        request_id = self._next_request_id()
 
         req = RequestState(
             request_id=request_id,
@@ -106,9 +142,9 @@ class Controller(Agent):
         )
         self._requests[request_id] = req
 
-        await self.send(
+        self.send_sync(
             req.user_agent,
-            "user_output",
+            MsgType.USER_OUTPUT,
             {"text": "[controller] Received request. Planning...", "final": False},
         )
 
@@ -117,41 +153,38 @@ class Controller(Agent):
             task_type="plan",
             request_id=request_id,
         )
-        await self.assign_task(task.id, "planner")
+        self._assign(task.id, "planner")
 
     async def _handle_task_result(self, message: Message) -> None:
         """Route results through the pipeline: plan → code → review → done."""
-        payload = message.payload
-        task_id: str | None = payload.get("task_id")
-        request_id: str | None = payload.get("request_id")
-        result_type: str = payload.get("result_type", "")
+        result = message.payload
+        if not isinstance(result, TaskResult):
+            await super().handle_message(message)
+            return
 
-        if task_id is not None:
-            task = self._tasks.get(task_id)
+        if result.task_id is not None:
+            task = self._tasks.pop(result.task_id, None)
             if task is not None:
                 task.status = "complete"
 
-        if request_id is None:
+        if result.request_id is None:
             return
-        req = self._requests.get(request_id)
+        req = self._requests.get(result.request_id)
         if req is None:
             return
 
-        if result_type == "plan":
-            await self._on_plan_complete(req, payload)
-        elif result_type == "code":
-            await self._on_code_complete(req, payload)
-        elif result_type == "review":
-            await self._on_review_complete(req, payload)
+        on_result = self._result_handlers.get(result.result_type)
+        if on_result is not None:
+            await on_result(req, result)
 
-    async def _on_plan_complete(self, req: RequestState, payload: dict[str, Any]) -> None:
-        subtasks: list[str] = payload.get("subtasks", [])
+    async def _on_plan_complete(self, req: RequestState, result: TaskResult) -> None:
+        subtasks = result.subtasks
         req.phase = "coding"
         req.pending_subtasks = len(subtasks)
 
-        await self.send(
+        self.send_sync(
             req.user_agent,
-            "user_output",
+            MsgType.USER_OUTPUT,
             {
                 "text": f"[controller] Plan ready. {len(subtasks)} coding task(s) dispatched.",
                 "final": False,
@@ -164,39 +197,48 @@ class Controller(Agent):
                 task_type="code",
                 request_id=req.request_id,
             )
-            await self.assign_task(task.id, "coder")
+            self._assign(task.id, "coder")
 
-    async def _on_code_complete(self, req: RequestState, payload: dict[str, Any]) -> None:
-        description = payload.get("description", "")
-        req.coded_items.append(payload)
+    async def _on_code_complete(self, req: RequestState, result: TaskResult) -> None:
+        description = result.description
+        req.coded_items.append(result)
         req.pending_subtasks -= 1
+        req.pending_output.append(f"[coder] Completed: {description}. Sending to review...")
 
-        await self.send(
-            req.user_agent,
-            "user_output",
-            {
-                "text": f"[coder] Completed: {description}. Sending to review...",
-                "final": False,
-            },
+        if req.pending_subtasks > 0:
+            # Coalesce the other completions that land in this loop iteration.
+            if not req.flush_scheduled:
+                req.flush_scheduled = True
+                asyncio.get_running_loop().call_soon(self._flush_output, req)
+            return
+
+        self._flush_output(req)
+        req.phase = "review"
+        task = self.create_task(
+            description=f"Review code for: {req.description}",
+            payload={"coded_items": req.coded_items},
+            task_type="review",
+            request_id=req.request_id,
         )
+        self._assign(task.id, "reviewer")
 
-        if req.pending_subtasks <= 0:
-            req.phase = "review"
-            task = self.create_task(
-                description=f"Review code for: {req.description}",
-                payload={"coded_items": req.coded_items},
-                task_type="review",
-                request_id=req.request_id,
-            )
-            await self.assign_task(task.id, "reviewer")
+    def _flush_output(self, req: RequestState) -> None:
+        """Send the buffered progress lines for ``req`` as a single user_output."""
+        req.flush_scheduled = False
+        if not req.pending_output:
+            return
+        text = "\n".join(req.pending_output)
+        req.pending_output.clear()
+        self.send_sync(req.user_agent, MsgType.USER_OUTPUT, {"text": text, "final": False})
 
-    async def _on_review_complete(self, req: RequestState, payload: dict[str, Any]) -> None:
-        verdict = payload.get("verdict", "done")
+    async def _on_review_complete(self, req: RequestState, result: TaskResult) -> None:
+        verdict = result.verdict or "done"
         req.phase = "done"
+        del self._requests[req.request_id]
 
-        await self.send(
+        self.send_sync(
             req.user_agent,
-            "user_output",
+            MsgType.USER_OUTPUT,
             {
                 "text": f"[reviewer] Review complete: {verdict}.",
                 "final": True,
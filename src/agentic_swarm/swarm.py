@@ -3,11 +3,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import uuid
 from collections.abc import Iterable
 
 from .agent import Agent
-from .communication import Message, MessageBus, create_message
+from .communication import MessageBus
 
 
 class Swarm:
@@ -27,40 +26,24 @@ class Swarm:
                 raise ValueError("all agents must share the same MessageBus")
 
         self.logger = logging.getLogger("agentic_swarm.swarm")
-        self._stop_event = asyncio.Event()
-        self._observer_name = f"_swarm_observer_{uuid.uuid4().hex}"
-        self._observer_queue: asyncio.Queue[Message] = self.bus.register_agent(self._observer_name)
 
     async def run(self, duration: float | None = None) -> None:
-        """Start all agents and run until stopped or duration elapses."""
+        """Start all agents and run until stopped or duration elapses.
+
+        Shutdown closes every inbox, so each agent's ``run`` returns on its own and the
+        task group exits; no separate watcher task is needed.
+        """
         async with asyncio.TaskGroup() as task_group:
             for agent in self.agents:
                 task_group.create_task(agent.run())
 
-            task_group.create_task(self._watch_for_shutdown())
-
-            if duration is None:
-                await self._stop_event.wait()
-            else:
-                await asyncio.sleep(duration)
-                await self.stop()
+            if duration is not None:
+                try:
+                    async with asyncio.timeout(duration):
+                        await self.bus.shutdown_event.wait()
+                except TimeoutError:
+                    await self.stop()
 
     async def stop(self) -> None:
         """Request shutdown for all agents."""
-        if self._stop_event.is_set():
-            return
-        self._stop_event.set()
-        message = create_message(
-            sender="swarm",
-            recipient=None,
-            message_type="shutdown",
-            payload=None,
-        )
-        await self.bus.send(message)
-
-    async def _watch_for_shutdown(self) -> None:
-        while not self._stop_event.is_set():
-            message = await self._observer_queue.get()
-            if message.type == "shutdown":
-                self._stop_event.set()
-                break
+        self.bus.shutdown()
@@ -4,7 +4,8 @@ from __future__ import annotations
 import logging
 
 from .agent import Agent
-from .communication import Message, MessageBus
+from .communication import Message, MessageBus, MsgType, ResultType, TaskResult
+from .controller import Task
 
 
 class PlannerAgent(Agent):
@@ -15,28 +16,29 @@ class PlannerAgent(Agent):
         self.logger = logging.getLogger(f"agentic_swarm.planner.{name}")
 
     async def handle_message(self, message: Message) -> None:
-        if message.type != "task_assign":
+        if message.type is not MsgType.TASK_ASSIGN:
             await super().handle_message(message)
             return
 
-        task = message.payload
-        description: str = task.description if hasattr(task, "description") else str(task)
-        self.logger.info("planning: %s", description)
+        task: Task = message.payload
+        description = task.description
+        if self._info:
+            self.logger.info("planning: %s", description)
 
-        subtasks = [
+        subtasks = (
             "Implement core logic",
             "Write tests",
-        ]
+        )
 
-        await self.send(
+        self.send_sync(
             "controller",
-            "task_result",
-            {
-                "task_id": task.id if hasattr(task, "id") else None,
-                "request_id": task.request_id if hasattr(task, "request_id") else None,
-                "result_type": "plan",
-                "subtasks": subtasks,
-            },
+            MsgType.TASK_RESULT,
+            TaskResult(
+                task_id=task.id,
+                request_id=task.request_id,
+                result_type=ResultType.PLAN,
+                subtasks=subtasks,
+            ),
         )
 
 
@@ -48,26 +50,27 @@ class CoderAgent(Agent):
         self.logger = logging.getLogger(f"agentic_swarm.coder.{name}")
 
     async def handle_message(self, message: Message) -> None:
-        if message.type != "task_assign":
+        if message.type is not MsgType.TASK_ASSIGN:
             await super().handle_message(message)
             return
 
-        task = message.payload
-        description: str = task.description if hasattr(task, "description") else str(task)
-        self.logger.info("coding: %s", description)
+        task: Task = message.payload
+        description = task.description
+        if self._info:
+            self.logger.info("coding: %s", description)
 
         code = f"# Stub implementation for: {description}\nprint('Hello from {description}')\n"
 
-        await self.send(
+        self.send_sync(
             "controller",
-            "task_result",
-            {
-                "task_id": task.id if hasattr(task, "id") else None,
-                "request_id": task.request_id if hasattr(task, "request_id") else None,
-                "result_type": "code",
-                "description": description,
-                "code": code,
-            },
+            MsgType.TASK_RESULT,
+            TaskResult(
+                task_id=task.id,
+                request_id=task.request_id,
+                result_type=ResultType.CODE,
+                description=description,
+                code=code,
+            ),
         )
 
 
@@ -79,22 +82,23 @@ class ReviewerAgent(Agent):
         self.logger = logging.getLogger(f"agentic_swarm.reviewer.{name}")
 
     async def handle_message(self, message: Message) -> None:
-        if message.type != "task_assign":
+        if message.type is not MsgType.TASK_ASSIGN:
             await super().handle_message(message)
             return
 
-        task = message.payload
-        description: str = task.description if hasattr(task, "description") else str(task)
-        self.logger.info("reviewing: %s", description)
+        task: Task = message.payload
+        description = task.description
+        if self._info:
+            self.logger.info("reviewing: %s", description)
 
-        await self.send(
+        self.send_sync(
             "controller",
-            "task_result",
-            {
-                "task_id": task.id if hasattr(task, "id") else None,
-                "request_id": task.request_id if hasattr(task, "request_id") else None,
-                "result_type": "review",
-                "description": description,
-                "verdict": "LGTM",
-            },
+            MsgType.TASK_RESULT,
+            TaskResult(
+                task_id=task.id,
+                request_id=task.request_id,
+                result_type=ResultType.REVIEW,
+                description=description,
+                verdict="LGTM",
+            ),
         )
@@ -0,0 +1,62 @@
+"""Shared pytest fixtures."""
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import Callable, Iterator, Mapping
+from pathlib import Path
+
+import pytest
+
+from agentic_swarm.communication import Inbox, MessageBus
+
+MakeBus = Callable[..., tuple[MessageBus, dict[str, Inbox]]]
+
+
+def pytest_asyncio_loop_factories(
+    config: pytest.Config, item: pytest.Item
+) -> Mapping[str, Callable[[], asyncio.AbstractEventLoop]]:
+    """Run async tests on uvloop when it is installed, else on the stock loop."""
+    try:
+        import uvloop
+    except ImportError:  # not installed, or on Windows
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture
+def make_bus() -> MakeBus:
+    """Build a bus with a passive inbox registered for each given name."""
+
+    def _make_bus(*names: str) -> tuple[MessageBus, dict[str, Inbox]]:
+        bus = MessageBus()
+        return bus, {name: bus.register_agent(name) for name in names}
+
+    return _make_bus
+
+
+@pytest.fixture(scope="session")
+def yaml_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A ``config.yml`` with ``a: {b: 1}``, written once per session. Do not modify it."""
+    path = tmp_path_factory.mktemp("cfg") / "config.yml"
+    path.write_text("a:\n  b: 1\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture(scope="session")
+def missing_yaml(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """A config path inside a fresh directory that is never created."""
+    return tmp_path_factory.mktemp("missing") / "missing.yml"
+
+
+@pytest.fixture
+def set_env() -> Iterator[None]:
+    """Set ``AGENTIC_SWARM_A__B=2`` for one test, restoring the previous value after."""
+    key = "AGENTIC_SWARM_A__B"
+    old = os.environ.get(key)
+    os.environ[key] = "2"
+    yield
+    if old is None:
+        del os.environ[key]
+    else:
+        os.environ[key] = old
@@ -2,11 +2,10 @@
 from __future__ import annotations
 
 import asyncio
-
-import pytest
+import logging
 
 from agentic_swarm.agent import Agent
-from agentic_swarm.communication import MessageBus
+from agentic_swarm.communication import MessageBus, create_message
 
 
 class NoopAgent(Agent):
@@ -14,7 +13,6 @@ class NoopAgent(Agent):
         return
 
 
-@pytest.mark.asyncio
 async def test_agent_send_and_broadcast() -> None:
     bus = MessageBus()
     sender = NoopAgent(name="sender", role="tester", bus=bus)
@@ -31,3 +29,62 @@ async def test_agent_send_and_broadcast() -> None:
     msg_sender = await asyncio.wait_for(sender.inbox.get(), timeout=0.1)
     assert msg_receiver.type == "notice"
     assert msg_sender.type == "notice"
+
+
+class RecordingAgent(Agent):
+    def __init__(self, name: str, bus: MessageBus) -> None:
+        super().__init__(name=name, role="tester", bus=bus)
+        self.seen: list[int] = []
+
+    async def handle_message(self, message) -> None:
+        self.seen.append(message.payload)
+
+
+async def test_agent_run_drains_queued_messages_before_shutdown() -> None:
+    bus = MessageBus()
+    agent = RecordingAgent(name="agent", bus=bus)
+
+    for value in range(3):
+        agent.inbox.put_nowait(create_message("test", "agent", "ping", value))
+    bus.shutdown()
+
+    await asyncio.wait_for(agent.run(), timeout=0.5)
+    assert agent.seen == [0, 1, 2]
+
+
+def test_agent_info_flag_follows_logger() -> None:
+    bus = MessageBus()
+    agent = NoopAgent(name="quiet", role="tester", bus=bus)
+
+    quiet = logging.getLogger("tests.agent.quiet")
+    quiet.setLevel(logging.WARNING)
+    agent.logger = quiet
+    assert agent._info is False
+
+    chatty = logging.getLogger("tests.agent.chatty")
+    chatty.setLevel(logging.INFO)
+    agent.logger = chatty
+    assert agent._info is True
+
+
+class EchoAgent(Agent):
+    """Re-sends every message to itself."""
+
+    def __init__(self, name: str, bus: MessageBus) -> None:
+        super().__init__(name=name, role="tester", bus=bus)
+        self.handled = 0
+
+    async def handle_message(self, message) -> None:
+        self.handled += 1
+        self.send_sync(self.name, "ping")
+
+
+async def test_agent_stops_after_shutdown_despite_self_sends() -> None:
+    bus = MessageBus()
+    agent = EchoAgent(name="agent", bus=bus)
+    agent.inbox.put_nowait(create_message("test", "agent", "ping"))
+    bus.shutdown()
+
+    await asyncio.wait_for(agent.run(), timeout=0.5)
+    assert agent.handled == 1
+    assert agent.inbox.empty()
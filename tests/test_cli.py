@@ -2,14 +2,16 @@
 from __future__ import annotations
 
 import asyncio
+import io
+import os
+import sys
 
 import pytest
 
-from agentic_swarm.cli import UserAgent
-from agentic_swarm.communication import MessageBus, create_message
+from agentic_swarm.cli import LINE_BUFFER, UserAgent
+from agentic_swarm.communication import MessageBus, MsgType, create_message
 
 
-@pytest.mark.asyncio
 async def test_user_agent_registers_on_bus() -> None:
     bus = MessageBus()
     user = UserAgent(name="user", bus=bus)
@@ -17,36 +19,64 @@ async def test_user_agent_registers_on_bus() -> None:
     assert user.role == "user"
 
 
-@pytest.mark.asyncio
-async def test_drain_inbox_collects_user_output() -> None:
+async def _until_handled(user: UserAgent) -> None:
+    """Yield until the listener has taken (and so handled) everything queued."""
+    while not user.inbox.empty():
+        await asyncio.sleep(0)
+
+
+async def test_listen_resolves_final_on_final_output(capsys: pytest.CaptureFixture[str]) -> None:
     bus = MessageBus()
     user = UserAgent(name="user", bus=bus)
+    final = user._expect_final()
+    listener = asyncio.create_task(user._listen())
 
-    msg1 = create_message("controller", "user", "user_output", {"text": "hello", "final": False})
-    msg2 = create_message("controller", "user", "user_output", {"text": "done", "final": True})
-    await user.inbox.put(msg1)
-    await user.inbox.put(msg2)
+    user.inbox.put_nowait(create_message(
+        "controller", "user", MsgType.USER_OUTPUT, {"text": "done", "final": True}
+    ))
+    async with asyncio.timeout(0.5):
+        await final
+    assert "done" in capsys.readouterr().out
 
-    results = await user._drain_inbox()
-    assert len(results) == 2
-    assert results[0]["text"] == "hello"
-    assert results[1]["text"] == "done"
+    bus.shutdown()
+    async with asyncio.timeout(0.5):
+        await listener
 
 
-@pytest.mark.asyncio
-async def test_drain_inbox_stops_on_shutdown() -> None:
+async def test_listen_releases_waiters_on_shutdown() -> None:
     bus = MessageBus()
     user = UserAgent(name="user", bus=bus)
-    user._running = True
+    final = user._expect_final()
+    listener = asyncio.create_task(user._listen())
+    await asyncio.sleep(0)
 
-    msg = create_message("swarm", "user", "shutdown", None)
-    await user.inbox.put(msg)
+    bus.shutdown()
+    async with asyncio.timeout(0.5):
+        await listener
 
-    await user._drain_inbox()
+    assert final.done()
+    assert user._lines.get_nowait() is None
     assert user._running is False
 
 
-@pytest.mark.asyncio
+async def test_listen_ignores_non_user_output() -> None:
+    bus = MessageBus()
+    user = UserAgent(name="user", bus=bus)
+    final = user._expect_final()
+    listener = asyncio.create_task(user._listen())
+
+    user.inbox.put_nowait(create_message("controller", "user", MsgType.TASK_ASSIGN, None))
+    async with asyncio.timeout(0.5):
+        await _until_handled(user)
+
+    assert user._final is final
+    assert not final.done()
+
+    bus.shutdown()
+    async with asyncio.timeout(0.5):
+        await listener
+
+
 async def test_wait_for_results_receives_final(capsys: pytest.CaptureFixture[str]) -> None:
     bus = MessageBus()
     user = UserAgent(name="user", bus=bus)
@@ -55,10 +85,10 @@ async def test_wait_for_results_receives_final(capsys: pytest.CaptureFixture[str
     async def feed_messages() -> None:
         await asyncio.sleep(0.05)
         msg = create_message(
-            "controller", "user", "user_output",
+            "controller", "user", MsgType.USER_OUTPUT,
             {"text": "[reviewer] Review complete: LGTM.", "final": True},
         )
-        await user.inbox.put(msg)
+        await user.handle_message(msg)
 
     asyncio.get_running_loop().create_task(feed_messages())
     await user._wait_for_results(timeout=2.0)
@@ -67,7 +97,6 @@ async def test_wait_for_results_receives_final(capsys: pytest.CaptureFixture[str
     assert "LGTM" in captured.out
 
 
-@pytest.mark.asyncio
 async def test_wait_for_results_times_out(capsys: pytest.CaptureFixture[str]) -> None:
     bus = MessageBus()
     user = UserAgent(name="user", bus=bus)
@@ -77,3 +106,106 @@ async def test_wait_for_results_times_out(capsys: pytest.CaptureFixture[str]) ->
 
     captured = capsys.readouterr()
     assert "timed out" in captured.out
+
+
+async def test_handle_message_indents_coalesced_lines(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    bus = MessageBus()
+    user = UserAgent(name="user", bus=bus)
+
+    msg = create_message(
+        "controller", "user", MsgType.USER_OUTPUT, {"text": "first\nsecond", "final": False}
+    )
+    await user.handle_message(msg)
+
+    assert capsys.readouterr().out == "  first\n  second\n"
+
+
+async def test_run_reads_commands_from_stdin(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(sys, "stdin", io.StringIO("status\nquit\n"))
+    bus = MessageBus()
+    user = UserAgent(name="user", bus=bus)
+
+    async with asyncio.timeout(2.0):
+        await user.run()
+
+    out = capsys.readouterr().out
+    assert "Swarm is running" in out
+    assert "Shutting down swarm..." in out
+    assert bus.shutdown_event.is_set()
+
+
+async def test_run_exits_on_stdin_eof(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(sys, "stdin", io.StringIO(""))
+    bus = MessageBus()
+    user = UserAgent(name="user", bus=bus)
+
+    async with asyncio.timeout(2.0):
+        await user.run()
+
+    # The reader's end-of-input marker ended the REPL, not a bus shutdown.
+    assert not bus.shutdown_event.is_set()
+
+
+async def test_run_again_after_eof_restarts_reader(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    bus = MessageBus()
+    user = UserAgent(name="user", bus=bus)
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO(""))
+    async with asyncio.timeout(2.0):
+        await user.run()
+    assert user._lines.empty()
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO("status\n"))
+    async with asyncio.timeout(2.0):
+        await user.run()
+    assert "Swarm is running" in capsys.readouterr().out
+
+
+async def test_reader_buffers_at_most_line_buffer_lines(monkeypatch: pytest.MonkeyPatch) -> None:
+    total = LINE_BUFFER * 3
+    monkeypatch.setattr(sys, "stdin", io.StringIO("status\n" * total))
+    user = UserAgent(name="user", bus=MessageBus())
+
+    user._start_reader()
+    async with asyncio.timeout(2.0):
+        while user._lines.qsize() < LINE_BUFFER:
+            await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    assert user._lines.qsize() == LINE_BUFFER
+
+    # Reading lines frees slots for the rest; the end-of-input marker follows them.
+    read = 0
+    async with asyncio.timeout(2.0):
+        while await user._lines.get() is not None:
+            user._line_slots.release()
+            read += 1
+    assert read == total
+
+
+async def test_cancelled_run_stops_listener(monkeypatch: pytest.MonkeyPatch) -> None:
+    # A pipe nobody writes to keeps the REPL waiting for input until it is cancelled.
+    read_fd, write_fd = os.pipe()
+    stdin = open(read_fd, encoding="utf-8")  # noqa: SIM115 - closed below
+    monkeypatch.setattr(sys, "stdin", stdin)
+    user = UserAgent(name="user", bus=MessageBus())
+
+    run = asyncio.create_task(user.run())
+    await asyncio.sleep(0.05)
+    reader = user._reader
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+    current = asyncio.current_task()
+    assert [task for task in asyncio.all_tasks() if task is not current] == []
+
+    os.close(write_fd)
+    assert reader is not None
+    reader.join(timeout=1.0)
+    stdin.close()
@@ -5,22 +5,91 @@ import asyncio
 
 import pytest
 
-from agentic_swarm.communication import MessageBus, create_message
+from agentic_swarm.communication import (
+    Inbox,
+    SharedState,
+    create_message,
+    create_message_ts,
+    release_message,
+)
 
+# One timeout guards each whole test instead of wrapping every get() in wait_for.
+pytestmark = pytest.mark.timeout(2)
 
-@pytest.mark.asyncio
-async def test_message_bus_direct_and_broadcast() -> None:
-    bus = MessageBus()
-    inbox_a = bus.register_agent("a")
-    inbox_b = bus.register_agent("b")
+
+async def test_message_bus_direct_and_broadcast(make_bus) -> None:
+    bus, inboxes = make_bus("a", "b")
+    inbox_a, inbox_b = inboxes["a"], inboxes["b"]
 
     await bus.send(create_message("a", "b", "ping", {"value": 1}))
-    msg_b = await asyncio.wait_for(inbox_b.get(), timeout=0.1)
+    msg_b = await inbox_b.get()
     assert msg_b.type == "ping"
     assert msg_b.payload == {"value": 1}
 
     await bus.send(create_message("a", None, "broadcast", None))
-    msg_a = await asyncio.wait_for(inbox_a.get(), timeout=0.1)
-    msg_b2 = await asyncio.wait_for(inbox_b.get(), timeout=0.1)
+    msg_a = await inbox_a.get()
+    msg_b2 = await inbox_b.get()
     assert msg_a.type == "broadcast"
     assert msg_b2.type == "broadcast"
+
+
+def test_create_message_ids_increase() -> None:
+    first = create_message("a", "b", "ping")
+    second = create_message("a", "b", "ping")
+    assert second.id > first.id
+    assert second.timestamp == 0.0
+
+
+async def test_create_message_ts_uses_loop_clock() -> None:
+    before = asyncio.get_running_loop().time()
+    message = create_message_ts("a", "b", "ping")
+    assert before <= message.timestamp <= asyncio.get_running_loop().time()
+
+
+def test_released_message_is_reused() -> None:
+    message = create_message("a", "b", "ping", {"value": 1})
+    release_message(message)
+
+    reused = create_message("b", "a", "pong")
+    assert reused is message
+    assert reused.sender == "b"
+    assert reused.type == "pong"
+    assert reused.payload is None
+
+
+def test_double_release_pools_message_once() -> None:
+    message = create_message("a", "b", "ping")
+    release_message(message)
+    release_message(message)
+
+    first = create_message("a", "b", "one")
+    second = create_message("a", "b", "two")
+    assert first is message
+    assert second is not first
+    assert first.type == "one"
+
+
+async def test_inbox_get_waits_for_put() -> None:
+    inbox = Inbox()
+    with pytest.raises(asyncio.QueueEmpty):
+        inbox.get_nowait()
+
+    getter = asyncio.create_task(inbox.get())
+    await asyncio.sleep(0)
+    assert not getter.done()
+
+    message = create_message("a", "b", "ping")
+    inbox.put_nowait(message)
+    assert await getter is message
+    assert inbox.empty()
+
+
+async def test_shared_state_snapshot_is_stable() -> None:
+    state = SharedState()
+    await state.set("a", 1)
+    snapshot = await state.snapshot()
+
+    await state.update({"a": 2, "b": 3})
+    assert snapshot == {"a": 1}
+    assert await state.get("a") == 2
+    assert await state.snapshot() == {"a": 2, "b": 3}
@@ -6,17 +6,44 @@ import pytest
 from agentic_swarm.config import load_config
 
 
-def test_load_config_env_override(tmp_path, monkeypatch) -> None:
-    path = tmp_path / "config.yml"
-    path.write_text("a:\n  b: 1\n", encoding="utf-8")
-
-    monkeypatch.setenv("AGENTIC_SWARM_A__B", "2")
-
-    config = load_config(path)
+def test_load_config_env_override(yaml_path, set_env) -> None:
+    config = load_config(yaml_path)
     assert config["a"]["b"] == 2
 
 
-def test_load_config_missing_file(tmp_path) -> None:
-    missing = tmp_path / "missing.yml"
+def test_load_config_missing_file(missing_yaml) -> None:
     with pytest.raises(FileNotFoundError):
-        load_config(missing)
+        load_config(missing_yaml)
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("3", 3),
+        ("1.5", 1.5),
+        ("yes", True),
+        ("Off", False),
+        ("null", None),
+        ("[1, 2]", [1, 2]),
+        ("'007'", "007"),
+        ("inf", "inf"),
+        ("hello", "hello"),
+    ],
+)
+def test_load_config_env_value_types(monkeypatch, raw, expected) -> None:
+    monkeypatch.setenv("AGENTIC_SWARM_VALUE", raw)
+
+    config = load_config(None)
+    assert config["value"] == expected
+
+
+def test_load_config_env_merges_nested_keys(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "config.yml"
+    path.write_text("a:\n  b:\n    c: 1\n    d: 2\n  e: flat\n", encoding="utf-8")
+
+    monkeypatch.setenv("AGENTIC_SWARM_A__B__C", "10")
+    monkeypatch.setenv("AGENTIC_SWARM_A__E__F", "nested")
+
+    config = load_config(path)
+    assert config["a"]["b"] == {"c": 10, "d": 2}
+    assert config["a"]["e"] == {"f": "nested"}
@@ -2,18 +2,54 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
+from dataclasses import replace
 
 import pytest
 
-from agentic_swarm.communication import MessageBus, create_message
+from agentic_swarm.communication import (
+    Inbox,
+    Message,
+    MessageBus,
+    MsgType,
+    ResultType,
+    TaskResult,
+    create_message,
+)
 from agentic_swarm.controller import Controller
 
+ControllerCtx = Callable[..., tuple[MessageBus, dict[str, Inbox], Controller]]
 
-@pytest.mark.asyncio
-async def test_controller_assign_task_sends_message() -> None:
-    bus = MessageBus()
-    worker_inbox = bus.register_agent("worker")
-    controller = Controller(name="controller", role="controller", bus=bus)
+
+@pytest.fixture
+def controller_ctx(make_bus) -> ControllerCtx:
+    """Build a bus with a user inbox, the given passive inboxes and a controller."""
+
+    def build(*names: str) -> tuple[MessageBus, dict[str, Inbox], Controller]:
+        bus, inboxes = make_bus("user", *names)
+        return bus, inboxes, Controller(name="controller", role="controller", bus=bus)
+
+    return build
+
+
+async def drain_exact(inbox: Inbox, n: int) -> list[Message]:
+    """Receive ``n`` messages in arrival order; callers bound it with ``asyncio.timeout``.
+
+    Messages the controller already queued are taken without awaiting; ``get`` is only
+    awaited once the inbox runs dry.
+    """
+    out: list[Message] = []
+    for _ in range(n):
+        try:
+            out.append(inbox.get_nowait())
+        except asyncio.QueueEmpty:
+            out.append(await inbox.get())
+    return out
+
+
+async def test_controller_assign_task_sends_message(controller_ctx) -> None:
+    _, inboxes, controller = controller_ctx("worker")
+    worker_inbox = inboxes["worker"]
 
     task = controller.create_task("do work", {"x": 1})
     await controller.assign_task(task.id, "worker")
@@ -21,100 +57,124 @@ async def test_controller_assign_task_sends_message() -> None:
     assert task.status == "assigned"
     assert task.assignee == "worker"
 
-    msg = await asyncio.wait_for(worker_inbox.get(), timeout=0.1)
-    assert msg.type == "task_assign"
+    msg = worker_inbox.get_nowait()
+    assert msg.type is MsgType.TASK_ASSIGN
     assert msg.payload.id == task.id
 
 
-@pytest.mark.asyncio
-async def test_pipeline_user_request_to_plan() -> None:
+async def test_pipeline_user_request_to_plan(controller_ctx) -> None:
     """user_request → controller creates plan task and assigns to planner."""
-    bus = MessageBus()
-    planner_inbox = bus.register_agent("planner")
-    user_inbox = bus.register_agent("user")
-    controller = Controller(name="controller", role="controller", bus=bus)
+    _, inboxes, controller = controller_ctx("planner")
+    planner_inbox, user_inbox = inboxes["planner"], inboxes["user"]
 
-    request = create_message("user", "controller", "user_request", "build a calculator")
+    request = create_message("user", "controller", MsgType.USER_REQUEST, "build a calculator")
     await controller.handle_message(request)
 
+    async with asyncio.timeout(0.5):
+        user_msg = await user_inbox.get()
+        planner_msg = await planner_inbox.get()
+
     # User should get a "Planning..." status message
-    user_msg = await asyncio.wait_for(user_inbox.get(), timeout=0.5)
-    assert user_msg.type == "user_output"
+    assert user_msg.type is MsgType.USER_OUTPUT
     assert "Planning" in user_msg.payload["text"]
 
     # Planner should get a task_assign
-    planner_msg = await asyncio.wait_for(planner_inbox.get(), timeout=0.5)
-    assert planner_msg.type == "task_assign"
+    assert planner_msg.type is MsgType.TASK_ASSIGN
     assert planner_msg.payload.task_type == "plan"
 
 
-@pytest.mark.asyncio
-async def test_pipeline_plan_to_code_to_review_to_done() -> None:
+async def test_pipeline_plan_to_code_to_review_to_done(controller_ctx) -> None:
     """Full pipeline: user_request → plan → code → review → final user_output."""
-    bus = MessageBus()
-    planner_inbox = bus.register_agent("planner")
-    coder_inbox = bus.register_agent("coder")
-    reviewer_inbox = bus.register_agent("reviewer")
-    user_inbox = bus.register_agent("user")
-    controller = Controller(name="controller", role="controller", bus=bus)
+    _, inboxes, controller = controller_ctx("planner", "coder", "reviewer")
+    planner_inbox = inboxes["planner"]
+    coder_inbox = inboxes["coder"]
+    reviewer_inbox = inboxes["reviewer"]
+    user_inbox = inboxes["user"]
+    cm = create_message
 
     # 1. Send user_request
-    request = create_message("user", "controller", "user_request", "build X")
+    request = cm("user", "controller", MsgType.USER_REQUEST, "build X")
     await controller.handle_message(request)
 
     # Drain user "Planning..." + planner task_assign
-    await asyncio.wait_for(user_inbox.get(), timeout=0.5)
-    planner_msg = await asyncio.wait_for(planner_inbox.get(), timeout=0.5)
+    async with asyncio.timeout(0.5):
+        await user_inbox.get()
+        planner_msg = await planner_inbox.get()
     task_obj = planner_msg.payload
     request_id = task_obj.request_id
 
     # 2. Planner returns subtasks
-    plan_result = create_message("planner", "controller", "task_result", {
-        "task_id": task_obj.id,
-        "request_id": request_id,
-        "result_type": "plan",
-        "subtasks": ["Implement core", "Write tests"],
-    })
+    plan_result = cm("planner", "controller", MsgType.TASK_RESULT, TaskResult(
+        task_id=task_obj.id,
+        request_id=request_id,
+        result_type=ResultType.PLAN,
+        subtasks=("Implement core", "Write tests"),
+    ))
     await controller.handle_message(plan_result)
 
-    # User gets "Plan ready" message
-    plan_msg = await asyncio.wait_for(user_inbox.get(), timeout=0.5)
+    # User gets "Plan ready" message, coder gets 2 task_assign messages
+    async with asyncio.timeout(0.5):
+        plan_msg = await user_inbox.get()
+        code_tasks = await drain_exact(coder_inbox, 2)
     assert "2 coding task(s)" in plan_msg.payload["text"]
-
-    # Coder gets 2 task_assign messages
-    code_task_1 = await asyncio.wait_for(coder_inbox.get(), timeout=0.5)
-    code_task_2 = await asyncio.wait_for(coder_inbox.get(), timeout=0.5)
-
-    # 3. Coder returns results
-    for ct in [code_task_1, code_task_2]:
-        code_result = create_message("coder", "controller", "task_result", {
-            "task_id": ct.payload.id,
-            "request_id": request_id,
-            "result_type": "code",
-            "description": ct.payload.description,
-            "code": "print('hello')",
-        })
-        await controller.handle_message(code_result)
-
-    # User gets 2 "Completed" messages
-    await asyncio.wait_for(user_inbox.get(), timeout=0.5)
-    await asyncio.wait_for(user_inbox.get(), timeout=0.5)
+    assert [ct.payload.description for ct in code_tasks] == ["Implement core", "Write tests"]
+
+    # 3. Both coder results arrive concurrently
+    code_template = TaskResult(
+        task_id=None,
+        request_id=request_id,
+        result_type=ResultType.CODE,
+        code="print('hello')",
+    )
+    async with asyncio.TaskGroup() as tg:
+        for ct in code_tasks:
+            task = ct.payload
+            payload = replace(code_template, task_id=task.id, description=task.description)
+            code_result = cm("coder", "controller", MsgType.TASK_RESULT, payload)
+            tg.create_task(controller.handle_message(code_result))
+
+    async with asyncio.timeout(0.5):
+        completed_msg = await user_inbox.get()
+        reviewer_msg = await reviewer_inbox.get()
+
+    # User gets both "Completed" lines in one coalesced message
+    assert completed_msg.payload["text"].count("Completed") == 2
 
     # Reviewer gets task_assign
-    reviewer_msg = await asyncio.wait_for(reviewer_inbox.get(), timeout=0.5)
     assert reviewer_msg.payload.task_type == "review"
 
     # 4. Reviewer returns LGTM
-    review_result = create_message("reviewer", "controller", "task_result", {
-        "task_id": reviewer_msg.payload.id,
-        "request_id": request_id,
-        "result_type": "review",
-        "description": "review",
-        "verdict": "LGTM",
-    })
+    review_result = cm("reviewer", "controller", MsgType.TASK_RESULT, TaskResult(
+        task_id=reviewer_msg.payload.id,
+        request_id=request_id,
+        result_type=ResultType.REVIEW,
+        description="review",
+        verdict="LGTM",
+    ))
     await controller.handle_message(review_result)
 
     # User gets final message
-    final_msg = await asyncio.wait_for(user_inbox.get(), timeout=0.5)
+    async with asyncio.timeout(0.5):
+        final_msg = await user_inbox.get()
     assert final_msg.payload["final"] is True
     assert "LGTM" in final_msg.payload["text"]
+
+    # Finished tasks and requests are not retained
+    assert not controller._tasks
+    assert not controller._requests
+
+
+async def test_task_request_assigns_first_pending_task(controller_ctx) -> None:
+    _, inboxes, controller = controller_ctx("worker")
+    worker_inbox = inboxes["worker"]
+
+    first = controller.create_task("first")
+    second = controller.create_task("second")
+    await controller.assign_task(first.id, "other")
+
+    await controller.handle_message(create_message("worker", "controller", MsgType.TASK_REQUEST))
+
+    msg = worker_inbox.get_nowait()
+    assert msg.type is MsgType.TASK_ASSIGN
+    assert msg.payload is second
+    assert second.assignee == "worker"
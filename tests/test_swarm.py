@@ -12,15 +12,27 @@ from agentic_swarm.swarm import Swarm
 
 class ShutdownAgent(Agent):
     async def run(self) -> None:
-        await asyncio.sleep(0)
         await self.request_shutdown()
         await super().run()
 
 
-@pytest.mark.asyncio
-async def test_swarm_stops_on_broadcast() -> None:
+async def test_swarm_stops_on_request_shutdown() -> None:
     bus = MessageBus()
     agent = ShutdownAgent(name="agent", role="tester", bus=bus)
     swarm = Swarm(agents=[agent], bus=bus)
 
-    await asyncio.wait_for(swarm.run(), timeout=0.5)
+    swarm_task = asyncio.create_task(swarm.run())
+    done, _ = await asyncio.wait({swarm_task}, timeout=0.5)
+    if not done:
+        swarm_task.cancel()
+        pytest.fail("swarm did not stop after shutdown was requested")
+    swarm_task.result()
+
+
+async def test_swarm_stops_after_duration() -> None:
+    bus = MessageBus()
+    agent = Agent(name="agent", role="tester", bus=bus)
+    swarm = Swarm(agents=[agent], bus=bus)
+
+    await asyncio.wait_for(swarm.run(duration=0.05), timeout=0.5)
+    assert bus.shutdown_event.is_set()